@@ -70,11 +70,7 @@ def quick_start(args, players: PlayerManager) -> MenuChoice:
     # Игрок
     if args.player:
         # Ищем по имени
-        player = None
-        for p in players.players.values():
-            if p.name.lower() == args.player.lower():
-                player = p
-                break
+        player = players.find_by_name(args.player)
 
         if not player:
             print(f"Creating player: {args.player}")
@@ -89,39 +85,8 @@ def quick_start(args, players: PlayerManager) -> MenuChoice:
     return MenuChoice(player, game_type, args.seed)
 
 
-def interactive_menu(players: PlayerManager, view: ConsoleView) -> MenuChoice:
-    """Интерактивное меню."""
-    menu = GameMenu(players, view)
-    return menu.run()
-
-
-def main():
-    """Главная функция."""
-    args = parse_args()
-
-    # Инициализация
-
-    players = PlayerManager("players.json")
-    view = ConsoleView()
-
-    if args.no_color:
-        view.COLORS = {k: '' for k in view.COLORS}
-
-    # Получаем настройки игры
-    if args.game and args.player:
-        # Полный набор аргументов — быстрый старт
-        choice = quick_start(args, players)
-    elif args.quick:
-        # Флаг --quick — быстрый старт с дефолтами
-        choice = quick_start(args, players)
-    else:
-        # Интерактивное меню
-        choice = interactive_menu(players, view)
-
-    if choice is None:
-        print("Goodbye!")
-        return 0
-
+def play_game(choice: MenuChoice, players: PlayerManager, view: ConsoleView) -> None:
+    """Сыграть одну партию и сохранить статистику."""
     # Создаём компоненты игры
     rules = GameFactory.create(choice.game_type)
     engine = SolitaireEngine(rules, choice.player.player_id)
@@ -158,8 +123,35 @@ def main():
             else:
                 print(f"\nGame saved. Score: {engine.state.score}")
 
-        print("Goodbye!")
 
+def main():
+    """Главная функция."""
+    args = parse_args()
+
+    # Инициализация
+
+    players = PlayerManager("players.json")
+    view = ConsoleView(no_color=args.no_color)
+
+    # Получаем настройки игры
+    menu = None
+    if args.game and args.player:
+        # Полный набор аргументов — быстрый старт
+        choice = quick_start(args, players)
+    elif args.quick:
+        # Флаг --quick — быстрый старт с дефолтами
+        choice = quick_start(args, players)
+    else:
+        # Интерактивное меню (одно на все партии — помнит последний выбор)
+        menu = GameMenu(players, view)
+        choice = menu.run()
+
+    # Быстрый старт — одна партия; после партии из меню оно предлагает повтор
+    while choice is not None:
+        play_game(choice, players, view)
+        choice = menu.run() if menu else None
+
+    print("Goodbye!")
     return 0
 
 
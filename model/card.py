@@ -1,7 +1,7 @@
 # model/card.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class Suit(Enum):
@@ -27,21 +27,61 @@ class Rank(Enum):
     KING = 13
 
 
-@dataclass(frozen=True)
+_RED_SUITS = (Suit.HEARTS, Suit.DIAMONDS)
+_SUIT_INDEX = {suit: i for i, suit in enumerate(Suit)}
+
+# Раскладка Card.packed: бит 7 — красная, биты 4-5 — масть, биты 0-3 — ранг
+PACKED_RED = 0x80
+PACKED_SUIT = 0x30
+PACKED_RANK = 0x0F
+
+
+@dataclass(frozen=True, slots=True)
 class Card:
+    """
+    Игральная карта. IMMUTABLE — поэтому все 104 варианта (52 карты × сторона)
+    создаются один раз; Card.of и переворот карты берут готовый экземпляр.
+    """
+
     suit: Suit
     rank: Rank
     face_up: bool = False
 
+    # Предвычисленные значения для горячих проверок правил
+    # (Enum.value и свойство color заметно дороже обычного атрибута)
+    rank_value: int = field(init=False, repr=False, compare=False)
+    red: bool = field(init=False, repr=False, compare=False)
+    packed: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        rank_value = self.rank.value
+        red = self.suit in _RED_SUITS
+        object.__setattr__(self, "rank_value", rank_value)
+        object.__setattr__(self, "red", red)
+        object.__setattr__(self, "packed",
+                           (red << 7) | (_SUIT_INDEX[self.suit] << 4) | rank_value)
+
+    # Неизменяемая карта из пула: копия — она сама
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'Card':
+        return self
+
+    @staticmethod
+    def of(suit: Suit, rank: Rank, face_up: bool = False) -> 'Card':
+        """Общий экземпляр карты из пула (без создания нового объекта)."""
+        return _CARD_POOL[suit, rank, bool(face_up)]
+
     def flip(self) -> 'Card':
         """ИММУТАБЕЛЬНОЕ переворачивание"""
-        return Card(self.suit, self.rank, not self.face_up)
+        return _CARD_POOL[self.suit, self.rank, not self.face_up]
 
     def make_face_up(self) -> 'Card':
-        return Card(self.suit, self.rank, True) if not self.face_up else self
+        return _CARD_POOL[self.suit, self.rank, True] if not self.face_up else self
 
     def make_face_down(self) -> 'Card':
-        return Card(self.suit, self.rank, False) if self.face_up else self
+        return _CARD_POOL[self.suit, self.rank, False] if self.face_up else self
 
     # === Сериализация ===
 
@@ -86,11 +126,7 @@ class Card:
         else:
             suit = Suit(suit_data)
 
-        return cls(
-            suit=suit,
-            rank=rank,
-            face_up=data.get("face_up", False)
-        )
+        return cls.of(suit, rank, data.get("face_up", False))
 
     @classmethod
     def from_str(cls, text: str, face_up: bool = True) -> Optional['Card']:
@@ -130,16 +166,16 @@ class Card:
             except ValueError:
                 return None
 
-        return cls(suit, rank, face_up)
+        return cls.of(suit, rank, face_up)
 
     # Только данные, никакого отображения!
     @property
     def color(self) -> str:
-        return "red" if self.suit in (Suit.HEARTS, Suit.DIAMONDS) else "black"
+        return "red" if self.red else "black"
 
     @property
     def is_red(self) -> bool:
-        return self.suit in (Suit.HEARTS, Suit.DIAMONDS)
+        return self.red
 
     @property
     def is_black(self) -> bool:
@@ -147,7 +183,7 @@ class Card:
 
     def is_opposite_color(self, other: 'Card') -> bool:
         """Проверка, что карты противоположного цвета"""
-        return self.is_red != other.is_red
+        return self.red != other.red
 
     def is_same_suit(self, other: 'Card') -> bool:
         """Проверка на одинаковую масть"""
@@ -155,7 +191,7 @@ class Card:
 
     def rank_difference(self, other: 'Card') -> int:
         """Разница в рангах (важно для правил типа 'карта должна быть на 1 меньше')"""
-        return self.rank.value - other.rank.value
+        return self.rank_value - other.rank_value
 
     def __str__(self) -> str:
         """Для пользовательского отображения"""
@@ -173,4 +209,11 @@ class Card:
 
     def __repr__(self) -> str:
         """Для отладки и логирования"""
-        return f"Card(suit={self.suit.name}, rank={self.rank.name}, face_up={self.face_up})"
\ No newline at end of file
+        return f"Card(suit={self.suit.name}, rank={self.rank.name}, face_up={self.face_up})"
+
+
+# Пул всех карт: ключ (масть, ранг, открыта)
+_CARD_POOL: Dict[Tuple[Suit, Rank, bool], Card] = {
+    (suit, rank, face_up): Card(suit, rank, face_up)
+    for suit in Suit for rank in Rank for face_up in (False, True)
+}
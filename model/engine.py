@@ -13,7 +13,12 @@ from .pile import Pile
 from .state import GameState
 from .move import Move
 from .history import HistoryManager
-from .rules.base import RuleSet
+from .rules.base import RuleSet, PileType
+from . import zobrist
+
+# Масти и ранги — кортежи, чтобы не проходить итератор Enum при каждой раздаче
+_SUITS = tuple(Suit)
+_RANKS = tuple(Rank)
 
 
 class SolitaireEngine:
@@ -66,10 +71,11 @@ class SolitaireEngine:
             moves_count=0,
             time_elapsed=0
         )
+        self._state.foundation_total = self.rules.count_foundation_cards(self._state)
 
         # 5. Сохраняем в истории
         self.history.clear()
-        self.history.push(self._state.copy(), move=None)
+        self.history.push(self._state, move=None)
 
         # 6. Сбрасываем счетчик карт
         self.cards_moved_count = 0  # Сброс при новой игре
@@ -91,10 +97,11 @@ class SolitaireEngine:
         try:
             # 1. Восстанавливаем состояние через метод модели
             self._state = GameState.from_dict(state_dict)
+            self._state.foundation_total = self.rules.count_foundation_cards(self._state)
 
             # 2. Сбрасываем историю (undo недоступно после загрузки)
             self.history.clear()
-            self.history.push(self._state.copy(), move=None)
+            self.history.push(self._state, move=None)
 
             # 3. Сбрасываем счетчик карт для текущей сессии
             self.cards_moved_count = 0
@@ -125,9 +132,9 @@ class SolitaireEngine:
     def _create_shuffled_deck(self, seed: Optional[int]) -> List[Card]:
         """Создать перемешанную колоду."""
         rng = random.Random(seed)
-        cards = [Card(suit, rank, face_up=False)
-                 for suit in Suit
-                 for rank in Rank]
+        cards = [Card.of(suit, rank, face_up=False)
+                 for suit in _SUITS
+                 for rank in _RANKS]
         rng.shuffle(cards)
         return cards
 
@@ -141,23 +148,34 @@ class SolitaireEngine:
         if not self.rules.can_draw(self._state):
             return False
 
-        new_state = self._state.copy()
+        # Одна копия на всё действие: перебор колоды и взятие идут по ней.
+        # Меняются только stock и waste, остальные стопки общие
+        new_state = self._state.shallow_copy("stock", "waste")
         draw_count = self.rules.get_draw_count()
 
-        # Recycle если колода пуста
+        # Recycle если колода пуста. Снимок в истории делит стопки с new_state,
+        # поэтому перед взятием заново копируем только stock и waste
         if new_state.stock.is_empty():
             if not self._recycle_stock(new_state):
                 return False
-            # После recycle обновляем состояние и берём карты
-            self._state = new_state
-            return self.draw()
+            if not self.rules.can_draw(new_state):
+                self._state = new_state
+                return False
+            new_state = new_state.shallow_copy("stock", "waste")
 
-        # Нормальное взятие карт
+        # Нормальное взятие карт (очки — по состоянию до взятия)
         actual_count = min(draw_count, len(new_state.stock))
-        cards = new_state.stock.take(actual_count)
-        cards = [card.make_face_up() for card in cards]
+        cards = [card.make_face_up() for card in new_state.stock.peek(actual_count)]
+        score_delta = self.rules.score_draw(new_state, cards)
+        stock_index = len(new_state.stock) - actual_count
+        waste_index = len(new_state.waste)
+        taken = new_state.stock.take(actual_count)
         new_state.waste.add(cards)
         new_state.moves_count += 1
+        # Взятие — обычное перемещение: закрытые карты уходят из stock,
+        # открытые ложатся в waste
+        new_state.hash ^= (zobrist.cards_hash("stock", taken, stock_index)
+                           ^ zobrist.cards_hash("waste", cards, waste_index))
         self.cards_flipped_count += actual_count
 
         # Создаём Move
@@ -167,12 +185,12 @@ class SolitaireEngine:
             cards=cards,
             from_index=len(new_state.stock),
             flipped_cards=[],
-            score_delta=self.rules.score_draw(self._state, cards)
+            score_delta=score_delta
         )
 
         # Применяем
         self._state = new_state
-        self.history.push(self._state.copy(), move)
+        self.history.push(self._state, move)
         self._notify("draw", {"count": actual_count})
 
         return True
@@ -218,7 +236,7 @@ class SolitaireEngine:
 
         # 7. Сохраняем новое состояние
         self._state = new_state
-        self.history.push(self._state.copy(), executed_move)
+        self.history.push(self._state, executed_move)
 
         # 8. Уведомляем о ходе
         self._notify("move_made", {
@@ -239,66 +257,123 @@ class SolitaireEngine:
         Реальное выполнение хода.
         Возвращает (новое_состояние, объект Move).
         """
-        # Копируем состояние
-        new_state = self._state.copy()
+        # Копируем состояние (текущее остаётся неизменным для подписчиков);
+        # свои копии нужны только двум меняющимся стопкам
+        new_state = self._state.shallow_copy(from_pile, to_pile)
 
-        # Получаем стопки
         source = new_state.get_pile(from_pile)
-        target = new_state.get_pile(to_pile)
-
-        if source is None or target is None:
+        if source is None or new_state.get_pile(to_pile) is None:
             print(f"❌ ERROR: Invalid piles! '{from_pile}' or '{to_pile}' not found.")
             print(f"🔍 Available piles: {list(new_state.piles.keys())}")
             raise ValueError(f"Invalid piles: {from_pile} or {to_pile}")
 
-        # Запоминаем состояние ДО хода
-        previous_state = self._state
+        move = self.apply_move(new_state, Move(
+            from_pile=from_pile,
+            to_pile=to_pile,
+            cards=source.peek(count),
+            from_index=len(source) - count
+        ))
 
-        # Берём карты
-        from_index = len(source) - count
-        cards = source.take(count)
+        # Увеличиваем общий счетчик карт и переворотов
+        self.cards_moved_count += count
+        self.cards_flipped_count += len(move.flipped_cards)
 
-        # Добавляем в целевую стопку
-        target.add(cards)
+        return new_state, move
 
-        # Увеличиваем общий счетчик карт ===
-        self.cards_moved_count += count
+    # === Make/unmake ходов на месте ===
 
-        # ПОЛУЧАЕМ ПЕРЕВЕРНУТЫЕ КАРТЫ
-        flipped_cards = self.rules.get_flipped_cards(previous_state,
-                                                     Move(from_pile, to_pile, cards, from_index))
-        # === Считаем перевороты при открытии карт ===
-        self.cards_flipped_count += len(flipped_cards)
+    def apply_move(self, state: GameState, move: Move) -> Move:
+        """
+        Выполнить перенос карт прямо в state, без копирования (make).
+        Стопки state меняются на месте — состояние движка или истории сюда
+        передавать только через copy(). Возвращает запись хода с перевёрнутыми картами и очками —
+        её достаточно, чтобы откатить ход через revert_move.
+
+        Поддерживаются переносы между tableau/foundation/waste
+        (то, что возвращает get_available_moves). Взятие из колоды
+        и перебор идут через draw().
+        """
+        source = state.get_pile(move.from_pile)
+        target = state.get_pile(move.to_pile)
+        if source is None or target is None:
+            raise ValueError(f"Invalid piles: {move.from_pile} or {move.to_pile}")
 
-        # Применяем переворачивание
-        for pile_name, card_index in flipped_cards:
-            pile = new_state.get_pile(pile_name)
-            if pile and card_index < len(pile):
-                pile[card_index] = pile[card_index].make_face_up()
+        count = len(move.cards)
+        from_index = len(source) - count
 
-        # Обновляем счётчики
-        move_for_score = Move(
-            from_pile=from_pile,
-            to_pile=to_pile,
-            cards=cards,
-            from_index=from_index
-        )
+        # Перевороты и очки считаются по состоянию ДО хода
+        flipped_cards = self.rules.get_flipped_cards(state, move)
+        score_delta = self.rules.score_move(state, move, state)
 
-        score_delta = self.rules.score_move(new_state, move_for_score, previous_state)
-        new_state.score += score_delta
-        new_state.moves_count += 1
+        target_index = len(target)
+        cards = source.take(count)
+        target.add(cards)
 
-        # Создаём объект хода
-        move = Move(
-            from_pile=from_pile,
-            to_pile=to_pile,
+        # Zobrist: карты уходят со старых мест и занимают новые
+        h = state.hash
+        h ^= zobrist.cards_hash(move.from_pile, cards, from_index)
+        h ^= zobrist.cards_hash(move.to_pile, cards, target_index)
+
+        for pile_name, card_index in flipped_cards:
+            pile = state.get_pile(pile_name)
+            if pile and card_index < len(pile):
+                old_card = pile[card_index]
+                pile[card_index] = old_card.make_face_up()
+                h ^= zobrist.card_key(old_card, pile_name, card_index)
+                h ^= zobrist.card_key(pile[card_index], pile_name, card_index)
+
+        state.hash = h
+        state.foundation_total += self._foundation_delta(move, count)
+        state.score += score_delta
+        state.moves_count += 1
+
+        return Move(
+            from_pile=move.from_pile,
+            to_pile=move.to_pile,
             cards=cards,
             from_index=from_index,
             flipped_cards=flipped_cards,
             score_delta=score_delta
         )
 
-        return new_state, move
+    def revert_move(self, state: GameState, move: Move) -> None:
+        """
+        Откатить ход, выполненный apply_move (unmake).
+        move — запись, которую вернул apply_move.
+        """
+        source = state.get_pile(move.from_pile)
+        target = state.get_pile(move.to_pile)
+
+        h = state.hash
+        for pile_name, card_index in move.flipped_cards:
+            pile = state.get_pile(pile_name)
+            if pile and card_index < len(pile):
+                old_card = pile[card_index]
+                pile[card_index] = old_card.make_face_down()
+                h ^= zobrist.card_key(old_card, pile_name, card_index)
+                h ^= zobrist.card_key(pile[card_index], pile_name, card_index)
+
+        count = len(move.cards)
+        target_index = len(target) - count
+        cards = target.take(count)
+        source.add(cards)
+
+        h ^= zobrist.cards_hash(move.to_pile, cards, target_index)
+        h ^= zobrist.cards_hash(move.from_pile, cards, len(source) - count)
+        state.hash = h
+        state.foundation_total -= self._foundation_delta(move, count)
+
+        state.score -= move.score_delta
+        state.moves_count -= 1
+
+    def _foundation_delta(self, move: Move, count: int) -> int:
+        """На сколько ход меняет число карт на базах."""
+        delta = 0
+        if self.rules.get_pile_type(move.to_pile) == PileType.FOUNDATION:
+            delta += count
+        if self.rules.get_pile_type(move.from_pile) == PileType.FOUNDATION:
+            delta -= count
+        return delta
 
     # === Отмена/повтор ===
 
@@ -351,10 +426,13 @@ class SolitaireEngine:
         if new_state.waste.is_empty():
             return False
 
-        cards = new_state.waste.take(len(new_state.waste))
-        cards.reverse()
-        cards = [card.make_face_down() for card in cards]
+        taken = new_state.waste.take(len(new_state.waste))
+        cards = [card.make_face_down() for card in reversed(taken)]
+        stock_index = len(new_state.stock)
         new_state.stock.add(cards)
+        # Открытые карты уходят из waste, закрытые ложатся в stock
+        new_state.hash ^= (zobrist.cards_hash("waste", taken, 0)
+                           ^ zobrist.cards_hash("stock", cards, stock_index))
 
         move = Move(
             from_pile="waste",
@@ -365,7 +443,7 @@ class SolitaireEngine:
             score_delta=self.rules.score_recycle(self._state)
         )
 
-        self.history.push(new_state.copy(), move)
+        self.history.push(new_state, move)
         self._notify("recycle", {"count": len(cards)})
 
         return True
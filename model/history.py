@@ -39,11 +39,16 @@ class HistoryManager:
     # === Основные операции ===
 
     def push(self, state: GameState, move: Optional[Move] = None) -> None:
+        """
+        Сохранить снимок состояния (копирует сам — вызывающему копировать не нужно).
+        Стопки делятся со state: движок меняет только стопки, скопированные
+        через shallow_copy, поэтому снимок от этого не портится.
+        """
         # Удаляем будущее
         self._entries = self._entries[:self._current + 1]
 
         # Добавляем новое состояние
-        entry = HistoryEntry(state=state.copy(), move=move)
+        entry = HistoryEntry(state=state.shallow_copy(), move=move)
         self._entries.append(entry)
         self._current += 1
 
@@ -68,7 +73,7 @@ class HistoryManager:
         self._notify_change()
 
         # Возвращаем копию чтобы не испортить историю
-        return self._entries[self._current].state.copy()
+        return self._entries[self._current].state.shallow_copy()
 
     def redo(self) -> Optional[GameState]:
         """
@@ -81,7 +86,7 @@ class HistoryManager:
         self._current += 1
         self._notify_change()
 
-        return self._entries[self._current].state.copy()
+        return self._entries[self._current].state.shallow_copy()
 
     # === Проверки ===
 
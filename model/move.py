@@ -4,12 +4,16 @@ Move — описание хода для истории.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Tuple, Optional
+from itertools import count as _count
+from typing import List, Tuple, Optional, Dict, Any
 from .card import Card
 
+# Порядковый номер хода вместо datetime.now(): перебор ходов создаёт
+# сотни Move, а реальное время фиксирует HistoryEntry при записи в историю
+_move_counter = _count()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Move:
     """
     Описание хода для истории.
@@ -30,7 +34,7 @@ class Move:
 
     # Метаданные
     score_delta: int = 0
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=_move_counter.__next__)
 
     def __post_init__(self):
         """Валидация после создания."""
@@ -39,6 +43,20 @@ class Move:
         if not all(isinstance(c, Card) for c in self.cards):
             raise TypeError("All cards must be Card instances")
 
+    # === Сериализация ===
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразовать ход в словарь для JSON (у slots-класса нет __dict__)."""
+        return {
+            "from_pile": self.from_pile,
+            "to_pile": self.to_pile,
+            "cards": [card.to_dict() for card in self.cards],
+            "count": self.count,
+            "from_index": self.from_index,
+            "flipped_cards": [list(f) for f in self.flipped_cards],
+            "score_delta": self.score_delta,
+        }
+
     @property
     def card_count(self) -> int:
         """Количество перемещённых карт."""
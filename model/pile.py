@@ -3,6 +3,7 @@
 Pile — стопка карт с дополнительными методами доступа.
 """
 
+from itertools import islice
 from typing import List, Optional, Iterator, Dict, Any
 from .card import Card
 
@@ -25,6 +26,12 @@ class Pile(List[Card]):
             return []
         return self[-n:] if len(self) >= n else self[:]
 
+    def iter_tail(self, n: int = 1) -> Iterator[Card]:
+        """Итератор по верхним n картам (снизу вверх) без копирования списка."""
+        if n <= 0:
+            return iter(())
+        return islice(self, max(len(self) - n, 0), None)
+
     def top(self) -> Optional[Card]:
         """Верхняя карта или None если пусто."""
         return self[-1] if self else None
@@ -140,9 +147,13 @@ class Pile(List[Card]):
     # === Копирование ===
 
     def copy(self) -> "Pile":
-        """Глубокая копия стопки."""
-        new_pile = Pile(self.name)
-        new_pile.extend([Card(c.suit, c.rank, c.face_up) for c in self])
+        """
+        Копия стопки (карты неизменяемы, поэтому общие с оригиналом).
+        Без Pile.__init__: пустой список того же класса и перенос карт.
+        """
+        new_pile = list.__new__(self.__class__)
+        new_pile.extend(self)
+        new_pile.name = self.name
         return new_pile
 
     # === Сериализация ===
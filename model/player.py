@@ -2,8 +2,8 @@
 Player — управление игроками и статистикой.
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 import json
 from pathlib import Path
 
@@ -16,6 +16,12 @@ class GameStats:
     best_score: int = 0
     best_time: int = 999999  # секунды
 
+    # Процент побед 0..100 — поддерживается в update, в JSON не пишется
+    win_rate_pct: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.win_rate_pct = self.win_rate() * 100
+
     def win_rate(self) -> float:
         """Процент побед."""
         if self.games_played == 0:
@@ -31,6 +37,16 @@ class GameStats:
             self.best_score = score
         if time_elapsed > 0 and time_elapsed < self.best_time:
             self.best_time = time_elapsed
+        self.win_rate_pct = self.win_rate() * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сохраняемые поля (без производного win_rate_pct)."""
+        return {
+            "games_played": self.games_played,
+            "games_won": self.games_won,
+            "best_score": self.best_score,
+            "best_time": self.best_time,
+        }
 
 
 @dataclass
@@ -40,6 +56,12 @@ class Player:
     name: str
     stats: Dict[str, GameStats] = field(default_factory=dict)
 
+    # Сумма игр по всем типам — поддерживается в finish_game
+    total_games: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.total_games = sum(s.games_played for s in self.stats.values())
+
     def get_stats(self, game_type: str) -> GameStats:
         """Получить статистику для игры (создаёт если нет)."""
         if game_type not in self.stats:
@@ -55,11 +77,12 @@ class Player:
             score=engine.state.score if engine.state else 0,
             time_elapsed=engine.state.time_elapsed if engine.state else 0
         )
+        self.total_games += 1
 
     @property
     def games_played(self) -> int:
         """Общее количество игр по всем типам."""
-        return sum(s.games_played for s in self.stats.values())
+        return self.total_games
 
     @property
     def win_rate(self) -> float:
@@ -77,6 +100,10 @@ class PlayerManager:
     def __init__(self, filename: str = "players.json"):
         self.filename = filename
         self.players: Dict[str, Player] = {}
+        # Игроки по убыванию (игр, % побед); None — пересчитать
+        self._sorted_cache: Optional[List[Player]] = None
+        # Имя в нижнем регистре -> первый игрок с таким именем
+        self._name_index: Dict[str, Player] = {}
         self._load()
 
     def _load(self) -> None:
@@ -104,14 +131,28 @@ class PlayerManager:
             # Файл повреждён — начинаем с чистого листа
             self.players = {}
 
+        self._reindex_names()
+
+    def _reindex_names(self) -> None:
+        """Перестроить индекс имён (при загрузке, удалении, переименовании)."""
+        self._name_index = {}
+        for player in self.players.values():
+            self._name_index.setdefault(player.name.lower(), player)
+
     def _save(self) -> None:
-        """Сохранить игроков в JSON."""
+        """
+        Сохранить игроков в JSON.
+        Любое изменение игроков заканчивается сохранением — здесь же
+        сбрасывается отсортированный список.
+        """
+        self._sorted_cache = None
+
         data = {}
         for player_id, player in self.players.items():
             data[player_id] = {
                 'name': player.name,
                 'stats': {
-                    game: asdict(stats)
+                    game: stats.to_dict()
                     for game, stats in player.stats.items()
                 }
             }
@@ -132,17 +173,33 @@ class PlayerManager:
 
         player = Player(player_id=player_id, name=name)
         self.players[player_id] = player
+        self._name_index.setdefault(name.lower(), player)
         self._save()
         return player
 
+    def sorted_players(self) -> List[Player]:
+        """Игроки по убыванию числа игр и процента побед (кэшируется)."""
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(
+                self.players.values(),
+                key=lambda p: (p.games_played, p.win_rate),
+                reverse=True
+            )
+        return self._sorted_cache
+
     def get_player(self, player_id: str) -> Optional[Player]:
         """Получить игрока по ID."""
         return self.players.get(player_id)
 
+    def find_by_name(self, name: str) -> Optional[Player]:
+        """Найти игрока по имени без учёта регистра."""
+        return self._name_index.get(name.lower())
+
     def delete_player(self, player_id: str) -> bool:
         """Удалить игрока."""
         if player_id in self.players:
             del self.players[player_id]
+            self._reindex_names()
             self._save()
             return True
         return False
@@ -151,6 +208,7 @@ class PlayerManager:
         """Переименовать игрока."""
         if player_id in self.players:
             self.players[player_id].name = new_name
+            self._reindex_names()
             self._save()
             return True
         return False
@@ -0,0 +1,105 @@
+"""
+model/rules/_klondike_fast.py
+Горячие проверки Косынки на целых числах.
+
+Карты передаются упакованными в один int (Card.packed: цвет, масть, ранг),
+без обращений к атрибутам Card/Pile — вызывающий код извлекает значения
+один раз. Модуль написан на чистом Python, чтобы его можно было
+скомпилировать (Cython/mypyc) без изменения вызовов.
+"""
+
+from model.card import PACKED_RED, PACKED_SUIT, PACKED_RANK
+
+KING = 13
+ACE = 1
+FOUNDATION_SIZE = 13
+
+
+def can_build_tableau(top: int, first: int, empty: bool) -> bool:
+    """Столбец: на пустой — только Король, иначе другой цвет и ранг на 1 меньше."""
+    if empty:
+        return first & PACKED_RANK == KING
+    return ((top ^ first) & PACKED_RED) != 0 and \
+        (top & PACKED_RANK) - (first & PACKED_RANK) == 1
+
+
+def can_build_foundation(top: int, card: int, size: int, count: int) -> bool:
+    """База: одна карта; пустая принимает Туза, иначе та же масть и ранг +1."""
+    if size >= FOUNDATION_SIZE or count != 1:
+        return False
+    if size == 0:
+        return card & PACKED_RANK == ACE
+    return ((top ^ card) & PACKED_SUIT) == 0 and \
+        (card & PACKED_RANK) - (top & PACKED_RANK) == 1
+
+
+def max_valid_run_len(run: list) -> int:
+    """
+    Длина самой длинной правильной последовательности сверху стопки
+    (чередование цветов, убывание на 1). Один проход от верхней карты.
+    """
+    n = len(run)
+    if n == 0:
+        return 0
+    length = 1
+    for i in range(n - 1, 0, -1):
+        upper = run[i - 1]
+        lower = run[i]
+        if ((upper ^ lower) & PACKED_RED) == 0 or \
+                (upper & PACKED_RANK) - (lower & PACKED_RANK) != 1:
+            break
+        length += 1
+    return length
+
+
+def tableau_targets(card: int, sizes: list, tops: list, skip: int = -1) -> list:
+    """
+    Индексы столбцов, куда можно положить карту card (или последовательность
+    с нижней картой card) — проверка сразу по всем целям. skip — столбец-источник.
+    """
+    return [
+        target for target in range(len(sizes))
+        if target != skip and sizes[target] >= 0
+        and can_build_tableau(tops[target], card, sizes[target] == 0)
+    ]
+
+
+def foundation_targets(card: int, found_sizes: list, found_tops: list) -> list:
+    """Индексы баз, куда можно положить одну карту card."""
+    return [
+        target for target in range(len(found_sizes))
+        if found_sizes[target] >= 0
+        and can_build_foundation(found_tops[target], card, found_sizes[target], 1)
+    ]
+
+
+def enumerate_tableau_moves(sizes: list, tops: list, runs: list,
+                            found_sizes: list, found_tops: list) -> list:
+    """
+    Легальные ходы из столбцов в виде кортежей (столбец, на_базу, цель, сколько).
+
+    Для каждого столбца: sizes — число карт (-1 если стопки нет), tops —
+    верхняя карта, runs — открытая часть снизу вверх. Для баз: found_sizes
+    (-1 если стопки нет), found_tops — верхняя карта. Карты — Card.packed.
+    Порядок ходов совпадает с перебором в KlondikeRules.get_available_moves.
+    """
+    moves = []
+
+    for col in range(len(sizes)):
+        run = runs[col]
+        face_up = len(run)
+
+        # Если верхние k карт правильные, то и любые меньшие — тоже
+        for take in range(1, max_valid_run_len(run) + 1):
+            first = run[face_up - take]
+
+            # На другие столбцы
+            for target in tableau_targets(first, sizes, tops, col):
+                moves.append((col, False, target, take))
+
+            # На базы — только одна карта
+            if take == 1:
+                for target in foundation_targets(first, found_sizes, found_tops):
+                    moves.append((col, True, target, 1))
+
+    return moves
@@ -129,6 +129,15 @@ class RuleSet(ABC):
         except TypeError:
             return rule(target_pile, cards)
 
+    # === БАЗЫ ===
+
+    def count_foundation_cards(self, state: "GameState") -> int:
+        """Сколько карт лежит на базах (для GameState.foundation_total)."""
+        return sum(
+            len(pile) for name, pile in state.piles.items()
+            if self.get_pile_type(name) == PileType.FOUNDATION
+        )
+
     # === ПОБОЧНЫЕ ЭФФЕКТЫ ===
 
     def get_flipped_cards(self, previous_state: "GameState", move: "Move") -> List[Tuple[str, int]]:
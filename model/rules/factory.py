@@ -2,7 +2,7 @@
 GameFactory — создание правил для разных пасьянсов с поддержкой вариантов.
 """
 
-from typing import Dict, Type, List
+from typing import Dict, Type, List, Optional
 from dataclasses import dataclass
 from .base import RuleSet
 from .klondike import KlondikeRules
@@ -30,6 +30,9 @@ class GameFactory:
     _variants: Dict[str, GameVariant] = {}
     _initialized: bool = False
 
+    # Кэш list_variants по фильтру base_game (сбрасывается в register_variant)
+    _variant_lists: Dict[Optional[str], List[GameVariant]] = {}
+
     @classmethod
     def _initialize(cls):
         """Инициализация стандартных вариантов."""
@@ -121,6 +124,7 @@ class GameFactory:
             raise ValueError(f"Variant {variant.name} already exists")
 
         cls._variants[variant.name] = variant
+        cls._variant_lists.clear()
 
     @classmethod
     def create_default(cls, variant_name: str) -> RuleSet:
@@ -129,13 +133,21 @@ class GameFactory:
 
     @classmethod
     def list_variants(cls, base_game: str = None) -> List[GameVariant]:
-        """Список вариантов, опционально фильтр по базовой игре."""
+        """
+        Список вариантов, опционально фильтр по базовой игре.
+        Результат кэшируется до следующего register_variant — не изменяйте его.
+        """
+        cached = cls._variant_lists.get(base_game)
+        if cached is not None:
+            return cached
+
         cls._initialize()
         variants = list(cls._variants.values())
 
         if base_game:
             variants = [v for v in variants if v.base_game == base_game]
 
+        cls._variant_lists[base_game] = variants
         return variants
 
     @classmethod
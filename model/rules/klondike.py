@@ -3,13 +3,37 @@ model/rules/klondike.py
 KlondikeRules — классическая косынка (Solitaire/Patience).
 """
 
-from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+import re
+from itertools import pairwise
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
     from model import Card, Pile, GameState, Move
 
 from .base import RuleSet, PileType
-from model import Pile, Card, Rank, Suit
+from ._klondike_fast import (
+    can_build_tableau, can_build_foundation, enumerate_tableau_moves,
+    tableau_targets, foundation_targets,
+)
+from model import Pile, Card, Suit
+from model.card import PACKED_RED, PACKED_RANK
+
+
+# Имена стопок считаются один раз, а не f-строкой в каждом переборе
+TABLEAU_NAMES = tuple(f"tableau_{col}" for col in range(7))
+FOUNDATION_NAMES = tuple(f"foundation_{i}" for i in range(4))
+
+# Буква масти в шорткатах → имя масти
+_SUIT_MAP = {
+    'h': 'HEARTS',
+    'd': 'DIAMONDS',
+    'c': 'CLUBS',
+    's': 'SPADES'
+}
+_SHORTCUT_FOUNDATIONS = {key: f"foundation_{name}" for key, name in _SUIT_MAP.items()}
+
+# Шорткаты "0h", "wc" и "t3s": источник (цифра или w) и буква масти
+_SHORTCUT_RE = re.compile(r'(?:([0-9w])|t([0-9]))([hdcs])')
 
 
 class KlondikeRules(RuleSet):
@@ -36,6 +60,24 @@ class KlondikeRules(RuleSet):
             self._validate_tableau_sequence,
         ]
 
+        # Типы всех стопок раздачи — get_pile_type делает один поиск в словаре
+        self._pile_type_cache: Dict[str, PileType] = {
+            "stock": PileType.STOCK,
+            "waste": PileType.WASTE,
+        }
+        for name in TABLEAU_NAMES:
+            self._pile_type_cache[name] = PileType.TABLEAU
+        for name in FOUNDATION_NAMES:
+            self._pile_type_cache[name] = PileType.FOUNDATION
+
+        # Очки за ход по паре (откуда, куда): +10 на базу, -15 за возврат с базы
+        self._score_table: Dict[Tuple[PileType, PileType], int] = {
+            (src, dst): 10 if dst == PileType.FOUNDATION else 0
+            for src in PileType for dst in PileType
+        }
+        self._score_table[(PileType.FOUNDATION, PileType.FOUNDATION)] = -15
+        self._score_table[(PileType.FOUNDATION, PileType.TABLEAU)] = -15
+
     # === ОСНОВНЫЕ МЕТОДЫ RULESET ===
 
     def check_win(self, state: "GameState") -> bool:
@@ -44,6 +86,10 @@ class KlondikeRules(RuleSet):
 
     def get_pile_type(self, pile_name: str) -> PileType:
         """Определить тип стопки."""
+        pile_type = self._pile_type_cache.get(pile_name)
+        if pile_type is not None:
+            return pile_type
+
         if pile_name.startswith("tableau_"):
             return PileType.TABLEAU
         if pile_name.startswith("foundation_"):
@@ -60,18 +106,18 @@ class KlondikeRules(RuleSet):
         idx = 0
 
         # Раздаём tableau
-        for col in range(7):
-            pile = Pile(f"tableau_{col}")
+        for col, name in enumerate(TABLEAU_NAMES):
+            pile = Pile(name)
             for row in range(col + 1):
                 card = deck[idx]
                 is_last = (row == col)
-                pile.put(Card(card.suit, card.rank, face_up=is_last))
+                pile.put(Card.of(card.suit, card.rank, face_up=is_last))
                 idx += 1
-            piles[f"tableau_{col}"] = pile
+            piles[name] = pile
 
         # Создаём 4 пустые базы (индексы 0-3, без привязки к масти!)
-        for i in range(4):
-            piles[f"foundation_{i}"] = Pile(f"foundation_{i}")
+        for name in FOUNDATION_NAMES:
+            piles[name] = Pile(name)
 
         return piles
 
@@ -82,36 +128,19 @@ class KlondikeRules(RuleSet):
         if not cards:
             return False
 
-        if pile.is_empty():
-            return cards[0].rank == Rank.KING
-
-        top = pile.top()
-        first = cards[0]
-
-        return (
-                top.color != first.color and
-                top.rank.value == first.rank.value + 1
-        )
+        if not pile:
+            return can_build_tableau(0, cards[0].packed, True)
+        return can_build_tableau(pile[-1].packed, cards[0].packed, False)
 
     def _can_build_foundation(self, pile: "Pile", cards: List["Card"]) -> bool:
         """База: пустая принимает Туза, занятая — карту той же масти +1 ранг."""
-        if len(pile) >= 13:
-            return False
-        if len(cards) != 1:
+        if not cards:
             return False
 
-        card = cards[0]
-
-        if pile.is_empty():
-            # Пустая база принимает ТОЛЬКО Туза (любой масти)
-            return card.rank == Rank.ACE
-
-        # Занятая база: проверяем масть и ранг относительно ВЕРХНЕЙ карты
-        top = pile.top()
-        return (
-                top.suit == card.suit and
-                card.rank.value == top.rank.value + 1
-        )
+        # Пустая база принимает ТОЛЬКО Туза (любой масти),
+        # занятая — карту той же масти и ранга +1 относительно ВЕРХНЕЙ карты
+        top = pile[-1].packed if pile else 0
+        return can_build_foundation(top, cards[0].packed, len(pile), len(cards))
 
     # === ВАЛИДАЦИЯ ХОДОВ ===
 
@@ -152,47 +181,21 @@ class KlondikeRules(RuleSet):
         if source is None:
             return False
 
-        # Проверяем, что берём открытые карты
-        if len(move.cards) > source.face_up_count():
-            return False
-
-        cards_from_end = source.peek(len(move.cards))
-
-        # Проверяем последовательность внутри
-        for i in range(len(cards_from_end) - 1):
-            curr = cards_from_end[i]
-            next_card = cards_from_end[i + 1]
-
-            if curr.color == next_card.color:
-                return False
-            if curr.rank.value != next_card.rank.value + 1:
-                return False
-
-        return True
+        # Количество открытых карт уже проверено в can_take (can_move вызывает его раньше)
+        return self._is_valid_sequence(source.iter_tail(len(move.cards)))
 
     # === СЧЁТ ===
 
     def score_move(self, state: "GameState", move: "Move",
                    previous_state: Optional["GameState"] = None) -> int:
         """Подсчёт очков за ход."""
-        score = 0
+        score = self._score_table[(self.get_pile_type(move.from_pile),
+                                   self.get_pile_type(move.to_pile))]
 
-        # Открытие карт
+        # Открытие карт (бывает только при ходе из tableau, поэтому
+        # со штрафами за ход с базы не пересекается)
         if previous_state:
-            flipped = self.get_flipped_cards(previous_state, move)
-            score += 5 * len(flipped)
-
-        # На foundation
-        if self.get_pile_type(move.to_pile) == PileType.FOUNDATION:
-            score += 10
-            # Штраф за обратный ход
-            if self.get_pile_type(move.from_pile) == PileType.FOUNDATION:
-                score = -15
-
-        # С foundation на tableau
-        elif (self.get_pile_type(move.from_pile) == PileType.FOUNDATION and
-              self.get_pile_type(move.to_pile) == PileType.TABLEAU):
-            score = -15
+            score += 5 * len(self.get_flipped_cards(previous_state, move))
 
         return score
 
@@ -229,196 +232,165 @@ class KlondikeRules(RuleSet):
     # === ПОБЕДА ===
 
     def _check_all_foundations_full(self, state: "GameState") -> bool:
-        """Проверить, что все 4 базы заполнены (по 13 карт)."""
-        for i in range(4):
-            pile = state.piles.get(f"foundation_{i}")
-            if pile is None or len(pile) != 13:
-                return False
-        return True
+        """
+        Проверить, что все 4 базы заполнены (по 13 карт).
+        База не принимает больше 13 карт, поэтому обычно достаточно счётчика
+        движка. Если он не равен 52 (не посчитан или стопки правили на месте),
+        проверяются сами базы.
+        """
+        if state.foundation_total == 52:
+            return True
+        piles = state.piles
+        return all(
+            len(piles.get(name, ())) == 13 for name in FOUNDATION_NAMES
+        )
 
     # === ПОДСКАЗКИ ===
 
     def get_available_moves(self, state: "GameState") -> List["Move"]:
         """Все возможные ходы в текущем состоянии."""
+        return [self._make_move(state, legal) for legal in self._enumerate_legal_tuples(state)]
+
+    def _make_move(self, state: "GameState", legal: Tuple[str, str, int, int]) -> "Move":
+        """Построить Move из кортежа (откуда, куда, сколько, индекс первой карты)."""
         from model import Move
-        moves = []
+
+        from_pile, to_pile, _, from_index = legal
+        return Move(
+            from_pile=from_pile,
+            to_pile=to_pile,
+            cards=state.get_pile(from_pile)[from_index:],
+            from_index=from_index
+        )
+
+    def _enumerate_legal_tuples(self, state: "GameState") -> List[Tuple[str, str, int, int]]:
+        """
+        Легальные ходы в виде кортежей (откуда, куда, сколько, индекс первой карты).
+        Move не создаётся — это делает вызывающий код только для нужных ходов.
+        """
+        # Ключ (откуда, куда, сколько) → индекс; дубликаты отбрасываются, порядок сохраняется
+        legal: Dict[Tuple[str, str, int], int] = {}
 
         # 1. ХОДЫ ИЗ STOCK/WASTE
         # Взять карты из колоды (если можно)
         # Не добавляем в moves, т.к. draw - отдельная команда
 
         # 2. ХОДЫ ИЗ TABLEAU
-        for col in range(7):
-            pile_name = f"tableau_{col}"
-            pile = state.piles.get(pile_name)
-            if not pile or pile.is_empty():
+        # Перебор идёт на числах
+        tableau = [state.piles.get(name) for name in TABLEAU_NAMES]
+        foundations = [state.piles.get(name) for name in FOUNDATION_NAMES]
+
+        sizes, tops, runs = [], [], []
+        for pile in tableau:
+            if pile is None:
+                sizes.append(-1)
+                tops.append(0)
+                runs.append([])
                 continue
 
-            # Сколько открытых карт можно взять
-            face_up_count = pile.face_up_count()
-            if face_up_count == 0:
-                continue
+            sizes.append(len(pile))
+            tops.append(pile[-1].packed if pile else 0)
+            # Открытая часть снизу вверх
+            runs.append([c.packed for c in pile[len(pile) - pile.face_up_count():]])
+
+        found_sizes = [-1 if pile is None else len(pile) for pile in foundations]
+        found_tops = [pile[-1].packed if pile else 0 for pile in foundations]
 
-            # Можно взять 1 карту или последовательность
-            for take_count in range(1, face_up_count + 1):
-                # Проверяем, что последовательность корректная
-                cards = pile.peek(take_count)
-                if not self._is_valid_sequence(cards):
-                    continue
-
-                # 2.1 ХОДЫ НА TABLEAU
-                for target_col in range(7):
-                    if target_col == col:
-                        continue
-
-                    target_name = f"tableau_{target_col}"
-                    target_pile = state.piles.get(target_name)
-
-                    # Создаем move для проверки
-                    move = Move(
-                        from_pile=pile_name,
-                        to_pile=target_name,
-                        cards=cards,
-                        from_index=len(pile) - take_count
-                    )
-
-                    # Проверяем валидность хода
-                    if self.can_move(state, move):
-                        moves.append(move)
-
-                # 2.2 ХОДЫ НА FOUNDATION
-                for i in range(4):
-                    target_name = f"foundation_{i}"
-                    target_pile = state.piles.get(target_name)
-
-                    # На foundation можно класть только 1 карту
-                    if take_count != 1:
-                        continue
-
-                    move = Move(
-                        from_pile=pile_name,
-                        to_pile=target_name,
-                        cards=cards,
-                        from_index=len(pile) - 1
-                    )
-
-                    if self.can_move(state, move):
-                        moves.append(move)
+        for col, to_foundation, target, take_count in enumerate_tableau_moves(
+                sizes, tops, runs, found_sizes, found_tops):
+            target_name = FOUNDATION_NAMES[target] if to_foundation else TABLEAU_NAMES[target]
+            legal.setdefault((TABLEAU_NAMES[col], target_name, take_count),
+                             sizes[col] - take_count)
 
         # 3. ХОДЫ ИЗ FOUNDATION
         # (обратно на tableau - со штрафом, но разрешено в некоторых ситуациях)
-        for i in range(4):
-            pile_name = f"foundation_{i}"
-            pile = state.piles.get(pile_name)
-            if not pile or pile.is_empty():
+        for pile_name, pile in zip(FOUNDATION_NAMES, foundations):
+            if not pile:
                 continue
 
-            # Берем верхнюю карту
-            cards = [pile.top()]
-
-            # Ходы на tableau
-            for target_col in range(7):
-                target_name = f"tableau_{target_col}"
-                move = Move(
-                    from_pile=pile_name,
-                    to_pile=target_name,
-                    cards=cards,
-                    from_index=len(pile) - 1
-                )
-
-                if self.can_move(state, move):
-                    moves.append(move)
+            # Верхнюю карту проверяем сразу по всем столбцам
+            for target in tableau_targets(pile[-1].packed, sizes, tops):
+                legal.setdefault((pile_name, TABLEAU_NAMES[target], 1), len(pile) - 1)
 
         # 4. ХОДЫ ИЗ WASTE
-        if state.waste and not state.waste.is_empty():
-            pile_name = "waste"
-            cards = [state.waste.top()]
-
-            # 4.1 На foundation
-            for i in range(4):
-                target_name = f"foundation_{i}"
-                # target_pile = state.piles.get(target_name)
-                move = Move(
-                    from_pile=pile_name,
-                    to_pile=target_name,
-                    cards=cards,
-                    from_index=len(state.waste) - 1
-                )
-                if self.can_move(state, move):
-                    moves.append(move)
-
-            # 4.2 На tableau
-            for target_col in range(7):
-                target_name = f"tableau_{target_col}"
-                move = Move(
-                    from_pile=pile_name,
-                    to_pile=target_name,
-                    cards=cards,
-                    from_index=len(state.waste) - 1
-                )
-                if self.can_move(state, move):
-                    moves.append(move)
-
-        # Удаляем дубликаты (если есть)
-        unique_moves = []
-        move_keys = set()
-        for move in moves:
-            key = (move.from_pile, move.to_pile, len(move.cards))
-            if key not in move_keys:
-                move_keys.add(key)
-                unique_moves.append(move)
-
-        return unique_moves
+        waste = state.waste
+        if waste:
+            card = waste[-1].packed
 
-    def _is_valid_sequence(self, cards: List["Card"]) -> bool:
-        """Проверка, что карты образуют правильную последовательность для перемещения."""
-        if len(cards) <= 1:
-            return True
+            # 4.1 На foundation, 4.2 на tableau
+            targets = [FOUNDATION_NAMES[t] for t in foundation_targets(card, found_sizes, found_tops)]
+            targets += [TABLEAU_NAMES[t] for t in tableau_targets(card, sizes, tops)]
 
-        for i in range(len(cards) - 1):
-            curr = cards[i]
-            next_card = cards[i + 1]
+            for target_name in targets:
+                legal.setdefault(("waste", target_name, 1), len(waste) - 1)
 
-            # Чередование цветов
-            if curr.color == next_card.color:
-                return False
-            # Убывание ранга
-            if curr.rank.value != next_card.rank.value + 1:
-                return False
+        return [(from_pile, to_pile, count, from_index)
+                for (from_pile, to_pile, count), from_index in legal.items()]
 
-        return True
+    def _is_valid_sequence(self, cards: Iterable["Card"]) -> bool:
+        """Проверка, что карты образуют правильную последовательность для перемещения."""
+        # Чередование цветов и убывание ранга — на упакованных картах, попарно
+        # (0 или 1 карта даёт пустой перебор → True)
+        return all(
+            ((a ^ b) & PACKED_RED) != 0 and (a & PACKED_RANK) - (b & PACKED_RANK) == 1
+            for a, b in pairwise(c.packed for c in cards)
+        )
 
     def get_hint(self, state: "GameState") -> Optional["Move"]:
         """Вернуть один возможный ход для подсказки."""
-        moves = self.get_available_moves(state)
+        # Приоритет: foundation > waste > tableau.
+        # Ход на foundation ищем без полного перебора
+        hint = self._fast_foundation_hint(state)
+        if hint is not None:
+            return hint
+
+        # Выбираем среди кортежей, Move строим только для подсказки
+        moves = self._enumerate_legal_tuples(state)
 
         if not moves:
             return None
 
-        # Приоритет: foundation > tableau > waste
-        foundation_moves = []
+        # Ходов на foundation уже нет
         tableau_moves = []
         waste_moves = []
 
         for move in moves:
-            if move.to_pile.startswith("foundation_"):
-                foundation_moves.append(move)
-            elif move.from_pile == "waste":
+            if move[0] == "waste":
                 waste_moves.append(move)
             else:
                 tableau_moves.append(move)
 
-        # Сначала ходы на foundation
-        if foundation_moves:
-            return foundation_moves[0]
-        # Потом из waste
+        # Сначала из waste
         if waste_moves:
-            return waste_moves[0]
+            return self._make_move(state, waste_moves[0])
         # Потом остальные
         if tableau_moves:
-            return tableau_moves[0]
+            return self._make_move(state, tableau_moves[0])
 
-        return moves[0] if moves else None
+        return self._make_move(state, moves[0])
+
+    def _fast_foundation_hint(self, state: "GameState") -> Optional["Move"]:
+        """
+        Первый ход на foundation: верхние карты столбцов 0-6, затем waste.
+        Тот же ход, что первым дал бы полный перебор, но за O(11) проверок.
+        """
+        foundations = [state.piles.get(name) for name in FOUNDATION_NAMES]
+        found_sizes = [-1 if pile is None else len(pile) for pile in foundations]
+        found_tops = [pile[-1].packed if pile else 0 for pile in foundations]
+
+        # Из столбца берётся только открытая карта, верх waste открыт всегда
+        sources = [(name, state.piles.get(name)) for name in TABLEAU_NAMES]
+        sources = [(name, pile) for name, pile in sources if pile and pile[-1].face_up]
+        if state.waste:
+            sources.append(("waste", state.waste))
+
+        for pile_name, pile in sources:
+            targets = foundation_targets(pile[-1].packed, found_sizes, found_tops)
+            if targets:
+                return self._make_move(
+                    state, (pile_name, FOUNDATION_NAMES[targets[0]], 1, len(pile) - 1))
+
+        return None
 
     def get_game_help(self) -> str:
         """Справка по правилам Косынки."""
@@ -465,51 +437,18 @@ Quick moves (no 'm'):
         Проверить, является ли команда шорткатом для Косынки.
         Возвращает (from_pile, to_pile, count) или None.
         """
-        command = command.lower().strip()
-
-        # Шорткаты вида "0h", "5d", "wc", "t3s"
-        if len(command) == 2:
-            source = command[0]
-            dest = command[1]
-
-            suit_map = {
-                'h': 'HEARTS',
-                'd': 'DIAMONDS',
-                'c': 'CLUBS',
-                's': 'SPADES'
-            }
-
-            if dest in suit_map:
-                # Источник - цифра (tableau)
-                if source.isdigit():
-                    from_pile = f"tableau_{source}"
-                    to_pile = f"foundation_{suit_map[dest]}"
-                    return (from_pile, to_pile, 1)
-
-                # Источник - waste
-                elif source == 'w':
-                    return ("waste", f"foundation_{suit_map[dest]}", 1)
-
-        # Шорткаты вида "t3s" (tableau_3 → spades)
-        if len(command) == 3 and command[0] == 't' and command[1].isdigit() and command[2] in 'hdcs':
-            col = command[1]
-            dest = command[2]
-            suit_map = {'h': 'HEARTS', 'd': 'DIAMONDS', 'c': 'CLUBS', 's': 'SPADES'}
-            from_pile = f"tableau_{col}"
-            to_pile = f"foundation_{suit_map[dest]}"
-            return (from_pile, to_pile, 1)
-
-        # Авто-ход из tableau (одна цифра)
-        if len(command) == 1 and command.isdigit():
-            # Это обрабатывается отдельно в _cmd_quick_move
+        # Шорткаты вида "0h", "5d", "wc", "t3s" (tableau_3 → spades).
+        # Одиночные "3" и "w" (авто-ход) обрабатываются в _cmd_quick_move
+        # и _cmd_quick_waste, здесь для них None.
+        match = _SHORTCUT_RE.fullmatch(command.lower().strip())
+        if match is None:
             return None
 
-        # Авто-ход из waste (w)
-        if command == 'w':
-            # Это обрабатывается отдельно в _cmd_quick_waste
-            return None
-
-        return None
+        source, col, dest = match.groups()
+        to_pile = _SHORTCUT_FOUNDATIONS[dest]
+        if source == 'w':
+            return ("waste", to_pile, 1)
+        return (f"tableau_{source or col}", to_pile, 1)
 
     # === СТРОКОВОЕ ПРЕДСТАВЛЕНИЕ ===
 
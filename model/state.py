@@ -4,15 +4,22 @@ GameState — чистое состояние игры.
 Только данные, никакой логики перемещений!
 """
 
+from collections import ChainMap
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from typing import Dict, Iterator, Mapping, Optional, Any, Tuple
 from .pile import Pile
+from . import zobrist
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     """
     Полное состояние игры в один момент времени.
+
+    hash поддерживается движком и set_pile; если стопки изменены на месте
+    (append/extend, piles[...] = ...), вызовите rehash().
+    foundation_total считают правила (какие стопки — базы, решают они),
+    движок обновляет его при ходах.
     """
 
     # Стопки игры
@@ -25,6 +32,12 @@ class GameState:
     moves_count: int = 0
     time_elapsed: int = 0
 
+    # Zobrist-хеш расположения карт (поддерживается движком при ходах)
+    hash: Optional[int] = field(default=None, compare=False)
+
+    # Сколько карт лежит на базах (None — не посчитано; задаёт движок)
+    foundation_total: Optional[int] = field(default=None, compare=False)
+
     def __post_init__(self):
         """
         Гарантирует, что stock и waste никогда не None.
@@ -34,19 +47,38 @@ class GameState:
             self.stock = Pile("stock")
         if self.waste is None:
             self.waste = Pile("waste")
+        if self.hash is None:
+            self.hash = zobrist.state_hash(self)
 
     # === Доступ к стопкам ===
 
     def get_pile(self, name: str) -> Optional[Pile]:
-        """Получить стопку по имени."""
+        """
+        Получить стопку по имени.
+        Сначала словарь piles (tableau/foundation — почти все запросы),
+        stock и waste проверяются только при промахе.
+        """
+        pile = self.piles.get(name)
+        if pile is not None:
+            return pile
         if name == "stock":
             return self.stock
         if name == "waste":
             return self.waste
-        return self.piles.get(name)
+        return None
 
     def set_pile(self, name: str, pile: Pile) -> None:
-        """Установить стопку по имени."""
+        """Установить стопку по имени (hash обновляется)."""
+        old = self.get_pile(name)
+        if old is not pile:
+            if old:
+                self.hash ^= zobrist.cards_hash(name, old, 0)
+            if pile:
+                self.hash ^= zobrist.cards_hash(name, pile, 0)
+        self._put_pile(name, pile)
+
+    def _put_pile(self, name: str, pile: Pile) -> None:
+        """Поставить стопку без пересчёта счётчиков (содержимое то же)."""
         pile.name = name
         if name == "stock":
             self.stock = pile
@@ -55,11 +87,22 @@ class GameState:
         else:
             self.piles[name] = pile
 
-    def all_piles(self) -> Dict[str, Pile]:
-        """Все стопки включая stock и waste."""
-        result = {"stock": self.stock, "waste": self.waste}
-        result.update(self.piles)
-        return result
+    def rehash(self) -> None:
+        """Пересчитать hash после правки стопок на месте."""
+        self.hash = zobrist.state_hash(self)
+
+    def all_piles(self) -> Mapping[str, Pile]:
+        """
+        Все стопки включая stock и waste — представление без копирования piles.
+        Порядок и приоритет как у {"stock", "waste"} + piles.
+        """
+        return ChainMap(self.piles, {"stock": self.stock, "waste": self.waste})
+
+    def iter_piles(self) -> Iterator[Tuple[str, Pile]]:
+        """Пары (имя, стопка) по всем стопкам — для однократного обхода."""
+        yield "stock", self.stock
+        yield "waste", self.waste
+        yield from self.piles.items()
 
     # === Копирование ===
 
@@ -67,26 +110,63 @@ class GameState:
         """
         Создать безопасную глубокую копию.
         """
-        # 1. Копируем словарь piles
-        new_piles = {}
-        if self.piles:
-            for name, pile in self.piles.items():
-                # Если pile вдруг None, создаем пустой
-                new_piles[name] = pile.copy() if pile else Pile(name)
+        return self.__copy__()
+
+    def __copy__(self) -> "GameState":
+        """
+        Копия без вызова __init__: все поля уже корректны, поэтому значения
+        по умолчанию и __post_init__ (пересчёт хеша) не нужны.
+        """
+        new = object.__new__(self.__class__)
+
+        # 1. Копируем словарь piles (если pile вдруг None, создаем пустой)
+        new.piles = {
+            name: pile.copy() if pile else Pile(name)
+            for name, pile in self.piles.items()
+        }
 
         # 2. Копируем stock и waste с защитой от None
-        new_stock = self.stock.copy() if self.stock else Pile("stock")
-        new_waste = self.waste.copy() if self.waste else Pile("waste")
-
-        # 3. Возвращаем новый объект
-        return GameState(
-            piles=new_piles,
-            stock=new_stock,
-            waste=new_waste,
-            score=self.score,
-            moves_count=self.moves_count,
-            time_elapsed=self.time_elapsed
-        )
+        new.stock = self.stock.copy() if self.stock else Pile("stock")
+        new.waste = self.waste.copy() if self.waste else Pile("waste")
+
+        # 3. Счётчики и хеш
+        new.score = self.score
+        new.moves_count = self.moves_count
+        new.time_elapsed = self.time_elapsed
+        new.hash = self.hash
+        new.foundation_total = self.foundation_total
+        return new
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "GameState":
+        """
+        copy.deepcopy без обхода полей: карты неизменяемы, поэтому
+        глубокая копия — это копии стопок из __copy__, а числа общие.
+        """
+        new = self.__copy__()
+        memo[id(self)] = new
+        return new
+
+    def shallow_copy(self, *mutable: str) -> "GameState":
+        """
+        Копия, делящая стопки с оригиналом. Состояние неизменяемо по
+        соглашению, поэтому копируются только стопки из mutable — те,
+        которые вызывающий код собирается менять.
+        """
+        new = object.__new__(self.__class__)
+        new.piles = self.piles.copy()
+        new.stock = self.stock
+        new.waste = self.waste
+        new.score = self.score
+        new.moves_count = self.moves_count
+        new.time_elapsed = self.time_elapsed
+        new.hash = self.hash
+        new.foundation_total = self.foundation_total
+
+        for name in mutable:
+            pile = new.get_pile(name)
+            if pile is not None:
+                new._put_pile(name, pile.copy())
+        return new
 
     # === Сериализация ===
 
@@ -0,0 +1,67 @@
+"""
+Zobrist — 64-битный хеш позиции для таблиц транспозиций.
+
+Каждой тройке (карта с учётом стороны, стопка, позиция в стопке) сопоставлен
+псевдослучайный 64-битный ключ; хеш позиции — XOR ключей всех карт.
+Ход меняет хеш за O(перемещённых карт): ключ старого места XOR-ится прочь,
+ключ нового — добавляется. Счёт и время в хеш не входят.
+"""
+
+from typing import Dict, Iterable, TYPE_CHECKING
+
+from .card import Card, PACKED_SUIT, PACKED_RANK
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+_MASK64 = (1 << 64) - 1
+
+# Индексы стопок выдаются при первом обращении (имена зависят от правил)
+_PILE_INDEX: Dict[str, int] = {}
+
+# Ключи считаются лениво и запоминаются
+_KEYS: Dict[int, int] = {}
+
+
+def _splitmix64(x: int) -> int:
+    """Детерминированное перемешивание 64-битного числа (splitmix64)."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _pile_index(pile_name: str) -> int:
+    index = _PILE_INDEX.get(pile_name)
+    if index is None:
+        index = _PILE_INDEX[pile_name] = len(_PILE_INDEX)
+    return index
+
+
+def card_key(card: Card, pile_name: str, position: int) -> int:
+    """Ключ карты (с учётом стороны) на позиции position в стопке pile_name."""
+    # Масть и ранг из упакованной карты + бит стороны
+    card_index = (card.packed & (PACKED_SUIT | PACKED_RANK)) | (card.face_up << 6)
+
+    slot = (card_index << 20) | (_pile_index(pile_name) << 10) | position
+    key = _KEYS.get(slot)
+    if key is None:
+        key = _KEYS[slot] = _splitmix64(slot)
+    return key
+
+
+def cards_hash(pile_name: str, cards: Iterable[Card], start: int) -> int:
+    """XOR ключей карт, лежащих в стопке подряд начиная с позиции start."""
+    h = 0
+    for position, card in enumerate(cards, start):
+        h ^= card_key(card, pile_name, position)
+    return h
+
+
+def state_hash(state: "GameState") -> int:
+    """Полный хеш позиции (для начального состояния и загрузки)."""
+    h = 0
+    for name, pile in state.iter_piles():
+        if pile:
+            h ^= cards_hash(name, pile, 0)
+    return h
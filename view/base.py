@@ -59,13 +59,15 @@ class GameView(ABC):
         pass
 
     @abstractmethod
-    def show_message(self, message: str, msg_type: str = "info") -> None:
+    def show_message(self, message: str, msg_type: str = "info",
+                     blocking: Optional[bool] = None) -> None:
         """
         Показать сообщение пользователю.
 
         Args:
             message: Текст сообщения
             msg_type: Тип — "info", "error", "success", "warning", "win"
+            blocking: Ждать подтверждения; None — решает View по типу
         """
         pass
 
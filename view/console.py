@@ -4,21 +4,35 @@ ConsoleView — консольная реализация отображения
 
 import os
 import sys
-import re
 from wcwidth import wcswidth
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    from model import GameState, Card
+    from model import GameState
     from controller import GameController
 
+from model import Card, Pile, Suit, Rank
 from .base import GameView
 
-ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+# Курсор в начало + очистка экрана (вместо запуска cls/clear)
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+
+def _enable_vt_mode() -> None:
+    """Windows: включить обработку ANSI-последовательностей в консоли."""
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (AttributeError, OSError):
+        pass
 
-def visible_length(text: str) -> int:
-    clean = ANSI_RE.sub('', text)
-    return wcswidth(clean)
 
 class ConsoleView(GameView):
     """Консольный интерфейс для пасьянса."""
@@ -44,6 +58,10 @@ class ConsoleView(GameView):
         'blue': '\033[94m',
     }
 
+    # Ширина столбца tableau (в видимых символах)
+    COL_WIDTH = 5
+    BLANK_CELL = " " * COL_WIDTH
+
     # Префиксы сообщений
     MSG_PREFIX = {
         'info': 'ℹ',
@@ -53,10 +71,52 @@ class ConsoleView(GameView):
         'win': '🏆',
     }
 
-    def __init__(self):
+    def __init__(self, no_color: bool = False):
         super().__init__()
         self.running = False
         self._last_state = None
+        self._last_fp = None
+
+        # Сообщения текущей команды: повторяются под следующим кадром,
+        # чтобы перерисовка их не стёрла (сбрасываются при вводе команды)
+        self._pending_messages = []
+        _enable_vt_mode()
+
+        if no_color:
+            self.COLORS = {k: '' for k in self.COLORS}
+        self._rebuild_render_cache()
+
+    def _rebuild_render_cache(self) -> None:
+        """
+        Пересобрать заготовки отрисовки из текущих COLORS.
+        Вызывать после любой замены COLORS, иначе старые цвета останутся в кадре.
+        """
+        self._last_fp = None
+
+        # Готовые шаблоны цветной карты: один format вместо двух поисков цвета
+        self._tpl_red = f"{self.COLORS['red']}{{}}{self.COLORS['reset']}"
+        self._tpl_black = f"{self.COLORS['black']}{{}}{self.COLORS['reset']}"
+
+        # Строки всех карт (52 × открыта/закрыта) считаются один раз, и те же
+        # строки, выровненные вправо по ширине столбца tableau (ширина — по
+        # тексту без цвета)
+        self._card_cache = {}
+        self._card_cells = {}
+        for suit in Suit:
+            for rank in Rank:
+                for face_up in (False, True):
+                    card = Card.of(suit, rank, face_up)
+                    key = (suit, rank, face_up)
+                    text = self._format_card(card)
+                    pad = max(self.COL_WIDTH - wcswidth(self._card_label(card)), 0)
+                    self._card_cache[key] = text
+                    self._card_cells[key] = " " * pad + text
+
+        # Минимальная справка под полем между кадрами не меняется
+        self._help_footer = (
+            f"\n{self._color('blue')}Commands:{self._reset()} (m)ove, (d)raw, (u)ndo, (n)ew, (q)uit, (h)elp"
+            f"\n{self._color('blue')}Quick:{self._reset()} 0-6(auto), w(waste), 0h/5d/wh/t3s"
+        )
 
     def _color(self, name: str) -> str:
         """Получить ANSI-код цвета."""
@@ -68,6 +128,10 @@ class ConsoleView(GameView):
 
     def card_to_str(self, card: "Card") -> str:
         """Преобразовать карту в строку с цветом."""
+        return self._card_cache[(card.suit, card.rank, card.face_up)]
+
+    def _card_label(self, card: "Card") -> str:
+        """Текст карты без цвета."""
         if not card.face_up:
             return f"[{self.SYMBOLS['BACK']}]"
 
@@ -76,28 +140,40 @@ class ConsoleView(GameView):
             card.rank.name[0] if card.rank.value > 10
             else str(card.rank.value)
         )
+        return rank_str + suit_symbol
 
-        color = 'red' if card.color == 'red' else 'black'
-
-        return f"{self._color(color)}{rank_str}{suit_symbol}{self._reset()}"
+    def _format_card(self, card: "Card") -> str:
+        """Строка карты с цветом (для таблицы _card_cache)."""
+        label = self._card_label(card)
+        if not card.face_up:
+            return label
 
-    def _show_mini_help(self) -> None:
-        """Показать минимальную справку (1-2 строки)."""
-        print(f"\n{self._color('blue')}Commands:{self._reset()} (m)ove, (d)raw, (u)ndo, (n)ew, (q)uit, (h)elp")
-        print(f"{self._color('blue')}Quick:{self._reset()} 0-6(auto), w(waste), 0h/5d/wh/t3s")
+        template = self._tpl_red if card.red else self._tpl_black
+        return template.format(label)
 
     def display_state(self,
                       state: "GameState",
                       selected_pile: Optional[str] = None,
                       selected_count: int = 1) -> None:
-        """Отобразить текущее состояние игры."""
+        """Отобразить текущее состояние игры (кадр собирается и выводится одной записью)."""
+        # Состояние неизменяемо по соглашению: те же объекты стопок — то же
+        # содержимое (прошлое состояние держим в _last_state, id не переиспользуются)
+        fp = (state.score, state.moves_count, id(state.stock), id(state.waste),
+              selected_pile, selected_count, *map(id, state.piles.values()))
+        if fp == self._last_fp:
+            # Экран не очищается — выведенные сообщения и так видны
+            self._pending_messages.clear()
+            return
+        self._last_fp = fp
+
         self._last_state = state
         self.clear()
+        out = []
 
         # Заголовок
-        print(f"{self._color('bold')}=== SOLITAIRE ==={self._reset()}")
-        print(f"{self._color('bold')}Score: {state.score} | Moves: {state.moves_count}{self._reset()}")
-        print("=" * 50)
+        out.append(f"{self._color('bold')}=== SOLITAIRE ==={self._reset()}")
+        out.append(f"{self._color('bold')}Score: {state.score} | Moves: {state.moves_count}{self._reset()}")
+        out.append("=" * 50)
 
         # Stock и Waste
         if state.stock:
@@ -112,60 +188,66 @@ class ConsoleView(GameView):
         else:
             waste_str = "[ ]"
 
-        print(f"Stock: {stock_str}  Waste: {waste_str}")
-        print()
+        out.append(f"Stock: {stock_str}  Waste: {waste_str}")
+        out.append("")
 
         # Foundations
-        print("Foundations:")
-        from model import Suit
-        for suit in Suit:
-            pile = state.piles.get(f"foundation_{suit.name}")
+        out.append("Foundations:")
+        parts = []
+        for suit_symbol, pile_name in _FOUNDATIONS:
+            pile = state.piles.get(pile_name)
             top_card = pile.top() if pile else None
             pile_str = self.card_to_str(top_card) if top_card else "[ ]"
-            suit_symbol = self.SYMBOLS[suit.name]
-            print(f"  {suit_symbol}: {pile_str}", end="  ")
-        print("\n")
+            parts.append(f"  {suit_symbol}: {pile_str}  ")
+        out.append("".join(parts))
+        out.append("")
 
         # Tableau (7 столбцов)
-        print("Tableau:")
+        out.append("Tableau:")
 
         # Находим максимальную высоту
-        tableau_piles = [
-            state.piles.get(f"tableau_{i}", [])
-            for i in range(7)
-        ]
+        tableau_piles = [state.piles.get(name, _EMPTY) for name in _TAB_NAMES]
         max_height = max((len(p) for p in tableau_piles), default=0)
-        COL_WIDTH = 5
+        COL_WIDTH = self.COL_WIDTH
 
         # Заголовки
         headers = " ".join(f"{i:>{COL_WIDTH - 1}}" for i in range(7))
-        print(f"     {headers}")
+        out.append(f"     {headers}")
 
         # Разделитель
-        print("    " + "-" * (COL_WIDTH * 7))
+        out.append("    " + "-" * (COL_WIDTH * 7))
 
-        # Строки
+        # Строки (части строки собираются в список и склеиваются один раз)
+        cells = self._card_cells
         for row in range(max_height):
-            line = f"{row:>2} |"
+            parts = [f"{row:>2} |"]
             for pile in tableau_piles:
                 if row < len(pile):
-                    card_str = self.card_to_str(pile[row])
-                    visible_len = visible_length(card_str)
-                    padding = COL_WIDTH - visible_len
-                    line += " " * max(padding, 0) + card_str
+                    card = pile[row]
+                    parts.append(cells[(card.suit, card.rank, card.face_up)])
                 else:
-                    line += " " * COL_WIDTH
-            print(line)
+                    parts.append(self.BLANK_CELL)
+            out.append("".join(parts))
 
         # 🔥 МИНИМАЛЬНАЯ СПРАВКА (ВСЕГДА)
-        self._show_mini_help()
+        out.append(self._help_footer)
+
+        # Сообщения, выведенные перед этой перерисовкой
+        for line in self._pending_messages:
+            out.append("")
+            out.append(line)
+        self._pending_messages.clear()
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     def clear(self) -> None:
         """Очистить консоль."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
 
     def get_input(self, prompt: str = "") -> str:
         """Получить команду от пользователя."""
+        self._pending_messages.clear()
         try:
             if prompt:
                 print(f"\n{prompt}", end="")
@@ -173,8 +255,14 @@ class ConsoleView(GameView):
         except (EOFError, KeyboardInterrupt):
             return 'q'
 
-    def show_message(self, message: str, msg_type: str = "info") -> None:
-        """Показать сообщение."""
+    def show_message(self, message: str, msg_type: str = "info",
+                     blocking: Optional[bool] = None) -> None:
+        """
+        Показать сообщение.
+
+        blocking — ждать Enter; по умолчанию только для победы. Остальные
+        сообщения не останавливают игру: они повторяются под следующим кадром.
+        """
         prefix = self.MSG_PREFIX.get(msg_type, '•')
         color = {
             'error': 'red',
@@ -183,10 +271,15 @@ class ConsoleView(GameView):
             'win': 'green',
         }.get(msg_type, 'reset')
 
-        print(f"\n{self._color(color)}{prefix} {message}{self._reset()}")
+        line = f"{self._color(color)}{prefix} {message}{self._reset()}"
+        sys.stdout.write(f"\n{line}\n")
 
-        if msg_type in ('error', 'win', 'success'):
+        if blocking is None:
+            blocking = msg_type == 'win'
+        if blocking:
             input("Press Enter to continue...")
+        else:
+            self._pending_messages.append(line)
 
     def ask_confirm(self, question: str) -> bool:
         """Задать вопрос да/нет."""
@@ -228,6 +321,16 @@ class ConsoleView(GameView):
         print(f"\n{self._color('green')}Thanks for playing!{self._reset()}")
 
 
+# Имена столбцов tableau и пустая стопка для отсутствующих столбцов
+_TAB_NAMES = tuple(f"tableau_{i}" for i in range(7))
+_EMPTY = Pile("empty")
+
+# Базы в порядке отображения: (символ масти, имя стопки)
+_FOUNDATIONS = tuple(
+    (ConsoleView.SYMBOLS[suit.name], f"foundation_{suit.name}") for suit in Suit
+)
+
+
 if __name__ == "__main__":
     print("\n❌ ОШИБКА: Нельзя запускать console.py напрямую!")
     print("✅ Запустите main.py из корня проекта:\n")
@@ -2,23 +2,44 @@
 Menu — интерфейс начала игры (выбор пасьянса, игрока, настроек).
 """
 
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable
 from dataclasses import dataclass
 import sys
-from pathlib import Path
-from model import Player, PlayerManager, GameFactory
-from view.base import GameView
 
-# Добавляем корень проекта в путь
-project_root = Path(__file__).parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+if TYPE_CHECKING:
+    from model import Player, PlayerManager
+    from view.base import GameView
+
+# Заставка собирается один раз при импорте
+_WELCOME_BANNER = r"""
+      ___           ___           ___                       ___           ___     
+     /\  \         /\  \         /\  \          ___        /\__\         /\__\    
+    /::\  \       /::\  \       /::\  \        /\  \      /::|  |       /:/  /    
+   /:/\:\  \     /:/\:\  \     /:/\ \  \       \:\  \    /:|:|  |      /:/__/     
+  /:/  \:\  \   /:/  \:\  \   _\:\~\ \  \      /::\__\  /:/|:|  |__   /::\__\____ 
+ /:/__/ \:\__\ /:/__/ \:\__\ /\ \:\ \ \__\  __/:/\/__/ /:/ |:| /\__\ /:/\:::::\__\
+ \:\  \  \/__/ \:\  \ /:/  / \:\ \:\ \/__/ /\/:/  /    \/__|:|/:/  / \/_|:|~~|~   
+  \:\  \        \:\  /:/  /   \:\ \:\__\   \::/__/         |:/:/  /     |:|  |    
+   \:\  \        \:\/:/  /     \:\/:/  /    \:\__\         |::/  /      |:|  |    
+    \:\__\        \::/  /       \::/  /      \/__/         /:/  /       |:|  |    
+     \/__/         \/__/         \/__/                     \/__/         \|__|    
+        """
+
+# Разделители экранов меню
+_RULE = "=" * 50
+_SEP = "\n" + _RULE
+
+
+def _write_lines(lines) -> None:
+    """Вывести строки одной записью в stdout."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 @dataclass
 class MenuChoice:
     """Результат выбора в меню."""
-    player: Player
+    player: "Player"
     game_type: str
     seed: Optional[int]
 
@@ -26,57 +47,37 @@ class MenuChoice:
 class GameMenu:
     """Консольное меню настройки игры."""
 
-    def __init__(self, player_manager: PlayerManager, view: "GameView"):
+    def __init__(self, player_manager: "PlayerManager", view: "GameView"):
         self.players = player_manager
         self.view = view
+        # Последний выбор — для быстрого повтора при следующем run()
+        self._last_choice: Optional[MenuChoice] = None
 
     def show_welcome(self) -> None:
         """Приветственный экран."""
         self.view.clear()
-        print(r"""
-      ___           ___           ___                       ___           ___     
-     /\  \         /\  \         /\  \          ___        /\__\         /\__\    
-    /::\  \       /::\  \       /::\  \        /\  \      /::|  |       /:/  /    
-   /:/\:\  \     /:/\:\  \     /:/\ \  \       \:\  \    /:|:|  |      /:/__/     
-  /:/  \:\  \   /:/  \:\  \   _\:\~\ \  \      /::\__\  /:/|:|  |__   /::\__\____ 
- /:/__/ \:\__\ /:/__/ \:\__\ /\ \:\ \ \__\  __/:/\/__/ /:/ |:| /\__\ /:/\:::::\__\
- \:\  \  \/__/ \:\  \ /:/  / \:\ \:\ \/__/ /\/:/  /    \/__|:|/:/  / \/_|:|~~|~   
-  \:\  \        \:\  /:/  /   \:\ \:\__\   \::/__/         |:/:/  /     |:|  |    
-   \:\  \        \:\/:/  /     \:\/:/  /    \:\__\         |::/  /      |:|  |    
-    \:\__\        \::/  /       \::/  /      \/__/         /:/  /       |:|  |    
-     \/__/         \/__/         \/__/                     \/__/         \|__|    
-        """)
-        print("=" * 50)
-        print("Welcome to Console Solitaire!")
-        print()
+        _write_lines((_WELCOME_BANNER, _RULE, "Welcome to Console Solitaire!", ""))
 
-    def select_player(self) -> Player:
+    def select_player(self) -> "Player":
         """Выбор или создание игрока."""
         # Показываем существующих
-        existing = sorted(
-            self.players.players.values(),
-            key=lambda p: (p.games_played, p.win_rate),
-            reverse=True
-        )
+        existing = self.players.sorted_players()
 
         if existing:
-            print("Existing players:")
+            lines = ["Existing players:"]
             for i, p in enumerate(existing, 1):
-                total_games = sum(s.games_played for s in p.stats.values())
-                print(f"  {i}. {p.name} ({total_games} games)")
-            print("  n. New player")
+                lines.append(f"  {i}. {p.name} ({p.total_games} games)")
+            lines.append("  n. New player")
+            _write_lines(lines)
 
             choice = self._ask_input("Select player (number or n): ")
 
             if choice.lower() == 'n':
                 return self._create_player()
 
-            try:
-                idx = int(choice) - 1
-                if 0 <= idx < len(existing):
-                    return existing[idx]
-            except ValueError:
-                pass
+            num = self._parse_int(choice)
+            if num is not None and 0 < num <= len(existing):
+                return existing[num - 1]
 
             print("Invalid choice, creating new player...")
             return self._create_player()
@@ -84,7 +85,7 @@ class GameMenu:
             print("No existing players found.")
             return self._create_player()
 
-    def _create_player(self) -> Player:
+    def _create_player(self) -> "Player":
         """Создание нового игрока."""
         name = self._ask_input("Enter your name: ").strip()
 
@@ -92,93 +93,106 @@ class GameMenu:
             name = "Player"
 
         # Проверяем уникальность
-        for p in self.players.players.values():
-            if p.name.lower() == name.lower():
-                print(f"Welcome back, {p.name}!")
-                return p
+        existing = self.players.find_by_name(name)
+        if existing:
+            print(f"Welcome back, {existing.name}!")
+            return existing
 
         player = self.players.create_player(name)
         print(f"Welcome, {player.name}!")
         return player
 
-    def select_game(self, player: Player) -> str:
+    def select_game(self, player: "Player") -> str:
         """Выбор типа пасьянса."""
-        print("\n" + "=" * 50)
-        print("Select game type:")
-
+        # Модель импортируется только когда меню дошло до выбора игры
+        from model import GameFactory
         variants = GameFactory.list_variants()
 
+        # Строки меню собираются один раз, повторный ввод их не пересчитывает
+        menu_lines = [_SEP, "Select game type:"]
         for i, v in enumerate(variants, 1):
             # Показываем статистику если есть
             stats = player.get_stats(v.name)
             played = f" (played: {stats.games_played}, won: {stats.games_won})" if stats.games_played else " (new)"
 
-            print(f"  {i}. {v.title}")
+            menu_lines.append(f"  {i}. {v.title}")
             if v.description:
-                print(f"     {v.description}")
-            print(f"     Stats: {played}")
-            print()
+                menu_lines.append(f"     {v.description}")
+            menu_lines.append(f"     Stats: {played}")
+            menu_lines.append("")
+        _write_lines(menu_lines)
 
         while True:
             choice = self._ask_input("Your choice (number): ")
 
-            try:
-                idx = int(choice) - 1
-                if 0 <= idx < len(variants):
-                    selected = variants[idx]
-                    print(f"Selected: {selected.title}")
-                    return selected.name
-            except ValueError:
-                pass
+            num = self._parse_int(choice)
+            if num is not None and 0 < num <= len(variants):
+                selected = variants[num - 1]
+                print(f"Selected: {selected.title}")
+                return selected.name
 
             print("Invalid choice, try again.")
 
     def select_seed(self) -> Optional[int]:
         """Выбор зерна для раздачи."""
-        print("\n" + "=" * 50)
-        print("Game setup:")
+        _write_lines((_SEP, "Game setup:"))
 
         use_seed = self._ask_confirm("Use specific seed for deal?")
 
         if use_seed:
             while True:
-                seed_str = self._ask_input("Enter seed number: ")
-                try:
-                    return int(seed_str)
-                except ValueError:
-                    print("Please enter a valid number.")
+                seed = self._parse_int(self._ask_input("Enter seed number: "))
+                if seed is not None:
+                    return seed
+                print("Please enter a valid number.")
 
         return None
 
-    def show_player_stats(self, player: Player) -> None:
+    def show_player_stats(self, player: "Player") -> None:
         """Показать статистику игрока."""
-        print("\n" + "=" * 50)
-        print(f"Statistics for {player.name}:")
+        lines = [_SEP, f"Statistics for {player.name}:"]
 
         if not player.stats:
-            print("  No games played yet.")
+            lines.append("  No games played yet.")
+            _write_lines(lines)
             return
 
         for game_key, stats in player.stats.items():
-            win_rate = stats.win_rate() * 100
-            print(f"\n  {game_key}:")
-            print(f"    Games: {stats.games_played}")
-            print(f"    Won: {stats.games_won} ({win_rate:.1f}%)")
-            print(f"    Best score: {stats.best_score}")
+            win_rate = stats.win_rate_pct
+            lines.append(f"\n  {game_key}:")
+            lines.append(f"    Games: {stats.games_played}")
+            lines.append(f"    Won: {stats.games_won} ({win_rate:.1f}%)")
+            lines.append(f"    Best score: {stats.best_score}")
             if stats.best_time < 999999:
-                print(f"    Best time: {stats.best_time}s")
+                lines.append(f"    Best time: {stats.best_time}s")
+        _write_lines(lines)
 
     def confirm_start(self) -> bool:
         """Подтверждение начала игры."""
-        print("\n" + "=" * 50)
+        print(_SEP)
         return self._ask_confirm("Start game?")
 
     def run(self) -> Optional[MenuChoice]:
         """
         ПОКАЗАТЬ меню и ВЕРНУТЬ выбор.
         НЕ запускает игру! Запуск делает main.py.
+        После партии (повторный вызов на том же меню) одним вопросом
+        предлагает повтор, полное меню или выход.
         """
         try:
+            last = self._last_choice
+            if last is not None:
+                action = self._ask_choice("Play again?", [
+                    f"Replay {last.game_type} as {last.player.name}",
+                    "Main menu",
+                    "Quit",
+                ])
+                if action == 0:
+                    self._last_choice = MenuChoice(last.player, last.game_type, None)
+                    return self._last_choice
+                if action == 2:
+                    return None
+
             self.show_welcome()
             player = self.select_player()
             self.show_player_stats(player)
@@ -189,7 +203,8 @@ class GameMenu:
                 print("Cancelled.")
                 return None
 
-            return MenuChoice(player, game_type, seed)
+            self._last_choice = MenuChoice(player, game_type, seed)
+            return self._last_choice
 
         except (EOFError, KeyboardInterrupt):
             self.view.show_message("Game cancelled", "warning")
@@ -205,10 +220,21 @@ class GameMenu:
             self.view.show_message("Game cancelled", "warning")
             raise  # пробрасываем для обработки в run()
 
+    @staticmethod
+    def _parse_int(text: str) -> Optional[int]:
+        """Целое число из ввода или None — без исключения на опечатках."""
+        text = text.strip()
+        digits = text[1:] if text[:1] in ("-", "+") else text
+        return int(text) if digits.isdecimal() else None
+
     def _ask_confirm(self, question: str) -> bool:
         """Запросить подтверждение через View."""
         return self.view.ask_confirm(question)
 
+    def _ask_choice(self, question: str, options: list) -> int:
+        """Запросить выбор из списка через View."""
+        return self.view.ask_choice(question, options)
+
 if __name__ == "__main__":
     print("\n❌ ОШИБКА: Нельзя запускать menu.py напрямую!")
     print("✅ Запустите main.py из корня проекта:\n")